@@ -1,115 +1,366 @@
+import argparse
+import io
+import mmap
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Preformatted
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.colors import grey
-
-def get_project_structure(start_path):
-    structure = []
-    for root, dirs, files in os.walk(start_path):
-        level = root.replace(start_path, '').count(os.sep)
-        indent = '  ' * level
-        structure.append(f"{indent}{os.path.basename(root)}/")
-        subindent = '  ' * (level + 1)
-        for f in files:
-            if f.endswith(('.html', '.ts', '.scss')):
-                structure.append(f"{subindent}{f}")
-    return '\n'.join(structure)
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+try:
+    # google-re2 runs in linear time with no backtracking; same API as re
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+# File reads release the GIL, so oversubscribe the CPUs to overlap I/O
+MAX_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Files above this size are decoded from an mmap instead of a bytes copy
+LARGE_FILE_BYTES = 128 * 1024
+
+# PDF layout, in points on a letter page
+PAGE_MARGIN = 72
+TITLE_FONT_SIZE = 18
+TITLE_LEADING = 22
+SECTION_FONT_SIZE = 18
+SECTION_LEADING = 22
+SECTION_GAP = 12
+FILE_HEADING_FONT_SIZE = 14
+FILE_HEADING_LEADING = 18
+FILE_HEADING_GAP = 6
+FILE_GAP = 22
+STRUCTURE_INDENT = 36
+STRUCTURE_LEADING = 8.8
+CODE_FONT_SIZE = 8
+CODE_LEADING = 10
+CODE_INDENT = 20
+CODE_BACKGROUND = 128
+TEXT_COLOR = 0
+
+# Build output and dependencies, never part of the report; dot-directories
+# are skipped as well, matching the TypeScript analyzer
+_SKIP_DIRS = frozenset({'node_modules', 'dist', '.git', '.angular', 'coverage'})
+
+# Indents for the structure listing, indexed by depth
+_INDENTS = tuple('  ' * i for i in range(128))
+
+# Match @import statements in SCSS
+_SCSS_IMPORT_RE = _regex.compile(r'@import\s+[\'"]([^\'"]+)[\'"]')
+# Match import statements in TypeScript; stays on one statement so minified
+# bundles without a "from" can't trigger runaway backtracking
+_TS_IMPORT_RE = _regex.compile(r'import[^;\n]*?from\s+[\'"]([^\'"]+)[\'"]')
+
+# Source extensions picked up by the walk, mapped to their import scanner
+_EXT_HANDLERS = {
+    '.html': None,
+    '.ts': _TS_IMPORT_RE.findall,
+    '.scss': _SCSS_IMPORT_RE.findall,
+}
+SOURCE_EXTENSIONS = tuple(_EXT_HANDLERS)
+# Marks names whose extension isn't a source type; None is a valid handler
+_NOT_SOURCE = object()
+
+def _extension(name):
+    dot = name.rfind('.')
+    return name[dot:] if dot >= 0 else ''
+
+def _skip_dir(name):
+    # Pruned before descending; node_modules imports are still resolved
+    # explicitly through resolve_import_path
+    return name in _SKIP_DIRS or name.startswith('.')
+
+def _handlers_for(extensions):
+    return {ext: _EXT_HANDLERS.get(ext) for ext in extensions}
+
+def _walk(path, handlers, name=None, level=0):
+    # Single os.scandir-based pass yielding (level, dir_name, file_entries),
+    # where file_entries holds (DirEntry, import scanner) pairs;
+    # is_dir()/is_file() reuse the dirent type instead of stat'ing each entry.
+    # os.fwalk is deliberately not used: it costs an extra lstat, open and
+    # fstat per directory, and its dir fds are closed long before the thread
+    # pool reads the files, so they can't be reused for dir_fd reads.
+    if name is None:
+        name = os.path.basename(path)
+    try:
+        scandir_it = os.scandir(path)
+    except OSError:
+        # Like os.walk, skip subdirectories that can't be read; an
+        # unreadable project root is still an error
+        if level == 0:
+            raise
+        return
+    file_entries = []
+    subdirs = []
+    with scandir_it as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # Directory symlinks are neither listed nor followed, as
+                # with os.walk(followlinks=False)
+                if not entry.is_symlink() and not _skip_dir(entry.name):
+                    subdirs.append(entry)
+            else:
+                handler = handlers.get(_extension(entry.name), _NOT_SOURCE)
+                if handler is not _NOT_SOURCE:
+                    file_entries.append((entry, handler))
+    yield level, name, file_entries
+    for subdir in subdirs:
+        yield from _walk(subdir.path, handlers, subdir.name, level + 1)
+
+def _indent(level):
+    return _INDENTS[level] if level < len(_INDENTS) else '  ' * level
+
+def _write_structure(buf, level, dir_name, file_entries):
+    # Lines are newline-separated, with no trailing newline
+    if buf.tell():
+        buf.write('\n')
+    buf.write(_indent(level))
+    buf.write(dir_name)
+    buf.write('/')
+    subindent = _indent(level + 1)
+    for entry, _ in file_entries:
+        buf.write('\n')
+        buf.write(subindent)
+        buf.write(entry.name)
+
+def get_project_structure(start_path, extensions=SOURCE_EXTENSIONS):
+    structure = io.StringIO()
+    for level, dir_name, file_entries in _walk(start_path, _handlers_for(extensions)):
+        _write_structure(structure, level, dir_name, file_entries)
+    return structure.getvalue()
+
+def _decode_mapped(fd):
+    # Decode straight from the mapped pages, skipping the bytes copy
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            return str(view, 'utf-8', 'replace')
+
+def _read_text(path):
+    # O_BINARY keeps Windows from opening the fd in CRT text mode
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        if os.fstat(fd).st_size > LARGE_FILE_BYTES:
+            return _decode_mapped(fd)
+        with open(fd, 'rb', closefd=False) as file:
+            return file.read().decode('utf-8', 'replace')
+    finally:
+        os.close(fd)
+
+@lru_cache(maxsize=None)
+def _read_cached(real_path):
+    # Decode once instead of going through the text layer; newlines are
+    # normalised by hand since universal-newline mode is no longer applied
+    text = _read_text(real_path)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
 
 def read_file_content(file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        return file.read()
+    # Keyed on the real path so shared imports are read from disk only once
+    return _read_cached(os.path.realpath(file_path))
 
 def find_imports(content, file_type):
-    imports = []
-    if file_type == '.scss':
-        # Match @import statements in SCSS
-        imports = re.findall(r'@import\s+[\'"]([^\'"]+)[\'"]', content)
-    elif file_type == '.ts':
-        # Match import statements in TypeScript
-        imports = re.findall(r'import.*?from\s+[\'"]([^\'"]+)[\'"]', content)
-    return imports
-
-def resolve_import_path(import_path, file_path, project_path):
+    handler = _EXT_HANDLERS.get(file_type)
+    return handler(content) if handler else []
+
+@lru_cache(maxsize=None)
+def resolve_import_path(import_path, file_dir, project_path):
     if import_path.startswith('~'):
         # This is likely a node_modules import
         return os.path.join(project_path, 'node_modules', import_path[1:])
     else:
         # This is likely a relative import
-        return os.path.join(os.path.dirname(file_path), import_path)
+        return os.path.join(file_dir, import_path)
+
+@lru_cache(maxsize=None)
+def _relpath(path, start):
+    # Shared imports resolve to the same paths across many files
+    return os.path.relpath(path, start)
 
-def gather_project_info(project_path):
+def gather_project_info(project_path, extensions=SOURCE_EXTENSIONS, include_contents=True):
+    # extensions limits which source files are listed and read at all. With
+    # include_contents=False only files that can carry imports (.ts/.scss)
+    # are read; the rest appear in the structure listing only.
+    structure = io.StringIO()
     project_info = {
-        'structure': get_project_structure(project_path),
-        'files': {}
+        'structure': '',
+        'files': []
     }
+    # Paths already in project_info['files'], which keeps (path, content)
+    # pairs in emission order
+    seen = set()
+
+    # One traversal feeds both the structure listing and the list of files
+    file_entries_all = []
+    for level, dir_name, file_entries in _walk(project_path, _handlers_for(extensions)):
+        _write_structure(structure, level, dir_name, file_entries)
+        if include_contents:
+            file_entries_all.extend(file_entries)
+        else:
+            file_entries_all.extend(
+                (entry, handler) for entry, handler in file_entries
+                if handler is not None
+            )
+
+    file_paths = [entry.path for entry, _ in file_entries_all]
+    with ThreadPoolExecutor(max_workers=MAX_READ_WORKERS) as executor:
+        contents = list(executor.map(read_file_content, file_paths))
+
+    for (entry, handler), content in zip(file_entries_all, contents):
+        file_path = entry.path
+        relative_path = os.path.relpath(file_path, project_path)
+        if relative_path not in seen:
+            seen.add(relative_path)
+            project_info['files'].append((relative_path, content))
 
-    for root, _, files in os.walk(project_path):
-        for file in files:
-            if file.endswith(('.html', '.ts', '.scss')):
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, project_path)
-                content = read_file_content(file_path)
-                project_info['files'][relative_path] = content
-
-                # Find and include imports
-                file_type = os.path.splitext(file)[1]
-                imports = find_imports(content, file_type)
-                for imp in imports:
-                    import_path = resolve_import_path(imp, file_path, project_path)
-                    if os.path.exists(import_path):
-                        import_relative_path = os.path.relpath(import_path, project_path)
-                        if import_relative_path not in project_info['files']:
-                            project_info['files'][import_relative_path] = read_file_content(import_path)
+        # Find and include imports
+        if handler is None:
+            continue
+        file_dir = os.path.dirname(file_path)
+        for imp in handler(content):
+            import_path = resolve_import_path(imp, file_dir, project_path)
+            if os.path.exists(import_path):
+                import_relative_path = _relpath(import_path, project_path)
+                if import_relative_path not in seen:
+                    seen.add(import_relative_path)
+                    project_info['files'].append((import_relative_path, read_file_content(import_path)))
 
+    project_info['structure'] = structure.getvalue()
+    # The contents now live in project_info; don't pin a second reference.
+    # The path caches go too: relpath results depend on the working
+    # directory when project_path is relative.
+    _read_cached.cache_clear()
+    resolve_import_path.cache_clear()
+    _relpath.cache_clear()
     return project_info
 
+def _latin1(text):
+    # The built-in PDF fonts only cover Latin-1
+    return text.encode('latin-1', 'replace').decode('latin-1')
+
+def _wrap_path(pdf, text):
+    # Break after '/' so long file paths wrap between directories; each
+    # segment is measured once. Returns None if one segment alone is wider
+    # than the page.
+    parts = text.split('/')
+    parts = [part + '/' for part in parts[:-1]] + parts[-1:]
+    lines = []
+    line, line_width = '', 0
+    for part in parts:
+        part_width = pdf.get_string_width(part)
+        if line and line_width + part_width > pdf.epw:
+            lines.append((line, line_width))
+            line, line_width = part, part_width
+        else:
+            line += part
+            line_width += part_width
+        if line_width > pdf.epw:
+            return None
+    lines.append((line, line_width))
+    return lines
+
+def _write_heading(pdf, text, size, leading, align='L'):
+    pdf.set_font('Helvetica', 'B', size)
+    text = _latin1(text)
+    lines = _wrap_path(pdf, text)
+    if lines is None:
+        # multi_cell's per-character line breaking is only paid for here
+        pdf.multi_cell(0, leading, text, align=align, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        return
+    baseline = leading / 2 + 0.3 * pdf.font_size
+    for line, line_width in lines:
+        if pdf.y + leading > pdf.page_break_trigger:
+            pdf.add_page()
+        x = pdf.l_margin
+        if align == 'C':
+            x += (pdf.epw - line_width) / 2
+        pdf.text(x, pdf.y + baseline, line)
+        pdf.set_y(pdf.y + leading)
+
+def _write_code(pdf, text, indent, right_indent=0, leading=CODE_LEADING, background=None):
+    # Source lines are placed with text(), a single text operator each;
+    # cell() costs far more per call. Page breaks are handled here: each
+    # page's run of lines gets one background rect, then the lines on top.
+    pdf.set_font('Courier', size=CODE_FONT_SIZE)
+    x = pdf.l_margin + indent
+    width = pdf.epw - indent - right_indent
+    # Same baseline offset cell() uses for vertically centred text
+    baseline = leading / 2 + 0.3 * pdf.font_size
+    lines = _latin1(text.expandtabs()).rstrip('\n').split('\n')
+    start = 0
+    while start < len(lines):
+        room = int((pdf.page_break_trigger - pdf.y) // leading)
+        if room < 1:
+            pdf.add_page()
+            continue
+        run = lines[start:start + room]
+        if background is not None:
+            pdf.set_fill_color(background)
+            pdf.rect(x, pdf.y, width, leading * len(run), style='F')
+            # text() wraps every line in a colour save/restore unless the
+            # fill colour matches the text colour
+            pdf.set_fill_color(TEXT_COLOR)
+        y = pdf.y + baseline
+        for line in run:
+            if line:
+                pdf.text(x, y, line)
+            y += leading
+        pdf.set_y(pdf.y + leading * len(run))
+        start += room
+
 def save_project_info_pdf(project_info, output_file):
-    doc = SimpleDocTemplate(output_file, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
+    pdf = FPDF(unit='pt', format='letter')
+    pdf.set_margins(PAGE_MARGIN, PAGE_MARGIN, PAGE_MARGIN)
+    pdf.set_auto_page_break(True, margin=PAGE_MARGIN)
+    pdf.set_text_color(TEXT_COLOR)
+    pdf.set_fill_color(TEXT_COLOR)
+    pdf.add_page()
 
     # Title
-    story.append(Paragraph("Project Information", styles['Title']))
-    story.append(Spacer(1, 12))
+    _write_heading(pdf, "Project Information", TITLE_FONT_SIZE, TITLE_LEADING, align='C')
+    pdf.ln(SECTION_GAP)
 
     # Project Structure
-    story.append(Paragraph("Project Structure", styles['Heading1']))
-    story.append(Spacer(1, 12))
-    story.append(Preformatted(project_info['structure'], styles['Code']))
-    story.append(Spacer(1, 12))
+    _write_heading(pdf, "Project Structure", SECTION_FONT_SIZE, SECTION_LEADING)
+    pdf.ln(SECTION_GAP)
+    _write_code(pdf, project_info['structure'], STRUCTURE_INDENT, leading=STRUCTURE_LEADING)
+    pdf.ln(SECTION_GAP)
 
     # File Contents
-    story.append(Paragraph("File Contents", styles['Heading1']))
-    story.append(Spacer(1, 12))
-
-    code_style = ParagraphStyle(
-        'Code',
-        parent=styles['BodyText'],
-        fontName='Courier',
-        fontSize=8,
-        leading=10,
-        leftIndent=20,
-        rightIndent=20,
-        backColor=grey,
-        spaceAfter=10
-    )
-
-    for file_path, content in project_info['files'].items():
-        story.append(Paragraph(file_path, styles['Heading2']))
-        story.append(Spacer(1, 6))
-        story.append(Preformatted(content, code_style))
-        story.append(Spacer(1, 12))
-
-    doc.build(story)
+    _write_heading(pdf, "File Contents", SECTION_FONT_SIZE, SECTION_LEADING)
+    pdf.ln(SECTION_GAP)
+
+    # Each file's content is dropped from project_info once it has been
+    # written; reversed once so each pop is O(1)
+    files = project_info['files']
+    files.reverse()
+    while files:
+        file_path, content = files.pop()
+        _write_heading(pdf, file_path, FILE_HEADING_FONT_SIZE, FILE_HEADING_LEADING)
+        pdf.ln(FILE_HEADING_GAP)
+        _write_code(pdf, content, CODE_INDENT, CODE_INDENT, background=CODE_BACKGROUND)
+        pdf.ln(FILE_GAP)
+
+    pdf.output(output_file)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Save an Angular project's structure and sources to a PDF.")
+    parser.add_argument('--no-html', action='store_true',
+                        help="leave .html templates out of the report entirely")
+    args = parser.parse_args()
+
     project_path = input("Enter the path to your project: ")
     output_file = input("Enter the name of the output file (e.g., project_info.pdf): ")
     
-    project_info = gather_project_info(project_path)
+    extensions = SOURCE_EXTENSIONS
+    if args.no_html:
+        extensions = tuple(ext for ext in extensions if ext != '.html')
+    project_info = gather_project_info(project_path, extensions)
     save_project_info_pdf(project_info, output_file)
     
     print(f"Project information has been saved to {output_file}")